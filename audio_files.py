@@ -0,0 +1,14 @@
+import os
+
+import aiofiles
+from telegram import InputFile
+
+
+async def read_audio_file(path: str) -> InputFile:
+    """
+    Читает аудиофайл целиком в пуле потоков, не блокируя цикл событий.
+    Имя файла передается явно, чтобы PTB не определял его сам.
+    """
+    async with aiofiles.open(path, "rb") as audio_file:
+        data = await audio_file.read()
+    return InputFile(data, filename=os.path.basename(path))
@@ -2,6 +2,7 @@ import asyncio
 import json
 import hashlib
 import logging
+from collections import OrderedDict
 from typing import Optional, List, Tuple
 
 import aiosqlite
@@ -11,6 +12,9 @@ from models import DownloadResult, Source, TrackInfo
 
 logger = logging.getLogger(__name__)
 
+# Сколько file_id держать в памяти перед обращением к БД
+FILE_ID_MEMORY_MAX = 500
+
 
 class CacheService:
     """
@@ -24,6 +28,8 @@ class CacheService:
         self._is_initialized = False
         self._init_lock = asyncio.Lock()
         self._cleanup_task: Optional[asyncio.Task] = None
+        # {track_id: file_id}: недавно использованные file_id, давно не использованные — в начале
+        self._file_ids: "OrderedDict[str, str]" = OrderedDict()
 
     async def initialize(self):
         """Инициализирует таблицы БД и запускает задачу очистки кэша."""
@@ -83,6 +89,17 @@ class CacheService:
                             )
                             """
                         )
+
+                        # Таблица file_id уже загруженных в Telegram треков
+                        await db.execute(
+                            """
+                            CREATE TABLE IF NOT EXISTS telegram_files (
+                                track_id TEXT PRIMARY KEY,
+                                file_id TEXT NOT NULL,
+                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                            )
+                            """
+                        )
                         await db.commit()
 
                     self._is_initialized = True
@@ -141,6 +158,58 @@ class CacheService:
         except Exception as e:
             logger.warning(f"Ошибка при записи в кэш: {e}")
 
+    # --- Методы для file_id Telegram ---
+
+    async def get_file_id(self, track_id: str) -> Optional[str]:
+        """Возвращает file_id трека, уже загруженного в Telegram, если он есть."""
+        file_id = self._file_ids.get(track_id)
+        if file_id is not None:
+            self._file_ids.move_to_end(track_id)
+            return file_id
+        if not self._is_initialized: return None
+        try:
+            async with aiosqlite.connect(self._db_path) as db:
+                cursor = await db.execute("SELECT file_id FROM telegram_files WHERE track_id = ?", (track_id,))
+                row = await cursor.fetchone()
+            if row:
+                self._remember_file_id(track_id, row[0])
+            return row[0] if row else None
+        except Exception as e:
+            logger.warning(f"Ошибка при чтении file_id для track_id {track_id}: {e}")
+            return None
+
+    async def set_file_id(self, track_id: str, file_id: str):
+        """Сохраняет file_id загруженного в Telegram трека для повторной отправки без загрузки."""
+        self._remember_file_id(track_id, file_id)
+        if not self._is_initialized: return
+        try:
+            async with aiosqlite.connect(self._db_path) as db:
+                await db.execute(
+                    "INSERT OR REPLACE INTO telegram_files (track_id, file_id) VALUES (?, ?)",
+                    (track_id, file_id)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Ошибка при сохранении file_id для track_id {track_id}: {e}")
+
+    async def delete_file_id(self, track_id: str):
+        """Забывает file_id, который Telegram больше не принимает."""
+        self._file_ids.pop(track_id, None)
+        if not self._is_initialized: return
+        try:
+            async with aiosqlite.connect(self._db_path) as db:
+                await db.execute("DELETE FROM telegram_files WHERE track_id = ?", (track_id,))
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Ошибка при удалении file_id для track_id {track_id}: {e}")
+
+    def _remember_file_id(self, track_id: str, file_id: str):
+        """Кладет file_id в память; при переполнении вытесняется давно не использованный."""
+        self._file_ids[track_id] = file_id
+        self._file_ids.move_to_end(track_id)
+        if len(self._file_ids) > FILE_ID_MEMORY_MAX:
+            self._file_ids.popitem(last=False)
+
     # --- Методы для рейтингов ---
 
     async def update_rating(self, user_id: int, track_id: str, rating: int) -> Tuple[int, int]:
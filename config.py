@@ -1,5 +1,6 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict, Tuple
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -28,6 +29,11 @@ class Settings(BaseSettings):
     CACHE_DB_PATH: Path = BASE_DIR / "cache.db"
     LOG_FILE_PATH: Path = BASE_DIR / "bot.log"
     COOKIES_FILE: Path = BASE_DIR / "cookies.txt"
+    # Отдельная директория: файл подменяется атомарно, а это невозможно для файла-точки монтирования
+    RADIO_PLAYLIST_PATH: Path = BASE_DIR / "data" / "radio_playlist.json"
+
+    # --- Настройки Bot API ---
+    TELEGRAM_HTTP_VERSION: Literal["1.1", "2"] = "1.1"  # "2" — HTTP/2 для запросов к Bot API
 
     # --- Настройки логгера ---
     LOG_LEVEL: str = "INFO"
@@ -35,6 +41,9 @@ class Settings(BaseSettings):
     # --- Настройки загрузчика ---
     MAX_QUERY_LENGTH: int = 150
     DOWNLOAD_TIMEOUT_S: int = 120
+    UPLOAD_TIMEOUT_S: int = 120            # Таймаут отправки аудиофайла в Telegram (по умолчанию PTB — 20 с)
+    DOWNLOAD_CONCURRENCY: int = 3          # Одновременных загрузок на загрузчик
+    DOWNLOAD_MIN_INTERVAL_S: float = 1.0   # Минимальный интервал между стартами загрузок
     
     # --- Настройки для команды /play ---
     PLAY_MAX_DURATION_S: int = 720    # 12 минут
@@ -48,16 +57,19 @@ class Settings(BaseSettings):
     # --- Настройки радио ---
     RADIO_SOURCE: str = "youtube"
     RADIO_COOLDOWN_S: int = 120
+    RADIO_PLAYLIST_TTL_S: int = 3600  # Сохраненный плейлист используется после перезапуска не дольше часа
+    RADIO_PLAYED_HISTORY_MAX: int = 5000  # Сколько последних сыгранных треков не повторяется
     RADIO_MAX_DURATION_S: int = 600   # 10 минут
     RADIO_MIN_DURATION_S: int = 60    # 1 минута
     RADIO_MIN_VIEWS: Optional[int] = 10000
     RADIO_MIN_LIKES: Optional[int] = 500
     RADIO_MIN_LIKE_RATIO: Optional[float] = 0.75 # Например, 0.75 для 75% лайков
-    RADIO_GENRES: List[str] = [
+    # Кортеж: список жанров не меняется, а random.sample/choice работают с ним напрямую
+    RADIO_GENRES: Tuple[str, ...] = (
         # --- Рок ---
         "rock", "classic rock", "psychedelic rock", "indie rock", "alternative rock", "hard rock", 
         "post-punk", "metal", "industrial", "gothic rock", "punk rock", "progressive rock",
-        "pop rock", "alternative rock", "grunge", "britpop", "emo", "indie rock",
+        "pop rock", "grunge", "britpop", "emo",
         "rock and roll",
 
         # --- Поп и танцевальная ---
@@ -101,8 +113,8 @@ class Settings(BaseSettings):
         "шансон", "бардовская песня", "авторская песня", "русские романсы",
         
         # --- Дополнительные ---
-        "bedroom pop"
-    ]
+        "bedroom pop",
+    )
 
     RADIO_MOODS: Dict[str, List[str]] = {
         # Новые "зумерские" настроения
@@ -126,5 +138,7 @@ class Settings(BaseSettings):
     CACHE_TTL_DAYS: int = 7
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
+    """Возвращает единственный экземпляр настроек (env читается один раз)."""
     return Settings()
@@ -45,20 +45,21 @@ def create_container(bot: Bot) -> punq.Container:
     container.register(RadioService, scope=punq.Scope.singleton)
 
     # --- Handlers ---
-    container.register(StartHandler)
-    container.register(PlayHandler)
-    container.register(DedicateHandler)
-    container.register(PlaylistHandler)
-    container.register(PinHelpMessageHandler)
-    container.register(MenuHandler)
-    container.register(ArtistReplyHandler)
-    container.register(AdminPanelHandler)
-    container.register(AdminCallbackHandler)
-    container.register(MenuCallbackHandler)
-    container.register(TrackCallbackHandler)
-    container.register(GenreCallbackHandler)
-    container.register(VoteCallbackHandler)
-    container.register(MoodCallbackHandler)
+    # Обработчики не хранят состояние запроса, поэтому достаточно одного экземпляра
+    container.register(StartHandler, scope=punq.Scope.singleton)
+    container.register(PlayHandler, scope=punq.Scope.singleton)
+    container.register(DedicateHandler, scope=punq.Scope.singleton)
+    container.register(PlaylistHandler, scope=punq.Scope.singleton)
+    container.register(PinHelpMessageHandler, scope=punq.Scope.singleton)
+    container.register(MenuHandler, scope=punq.Scope.singleton)
+    container.register(ArtistReplyHandler, scope=punq.Scope.singleton)
+    container.register(AdminPanelHandler, scope=punq.Scope.singleton)
+    container.register(AdminCallbackHandler, scope=punq.Scope.singleton)
+    container.register(MenuCallbackHandler, scope=punq.Scope.singleton)
+    container.register(TrackCallbackHandler, scope=punq.Scope.singleton)
+    container.register(GenreCallbackHandler, scope=punq.Scope.singleton)
+    container.register(VoteCallbackHandler, scope=punq.Scope.singleton)
+    container.register(MoodCallbackHandler, scope=punq.Scope.singleton)
 
     # --- Downloader Factory ---
     def get_downloader() -> BaseDownloader:
@@ -3,7 +3,9 @@ import glob
 import logging
 import random
 import re
+import time
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 
 import aiohttp
@@ -16,6 +18,23 @@ from cache_service import CacheService
 logger = logging.getLogger(__name__)
 
 
+def _parse_ia_length(value: Any) -> Optional[int]:
+    """
+    Длительность записи Internet Archive в секундах. Поле length бывает
+    числом ("225.3") или строкой вида "3:45" / "1:02:03"; нераспознанное — None.
+    """
+    try:
+        if isinstance(value, str) and ":" in value:
+            seconds = 0.0
+            for part in value.split(":"):
+                seconds = seconds * 60 + float(part)
+        else:
+            seconds = float(value)
+        return int(seconds)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
 class BaseDownloader(ABC):
     """
     Абстрактный базовый класс для всех загрузчиков.
@@ -26,7 +45,11 @@ class BaseDownloader(ABC):
         self._settings = settings
         self._cache = cache_service
         self.name = self.__class__.__name__
-        self.semaphore = asyncio.Semaphore(3)
+        self.semaphore = asyncio.Semaphore(settings.DOWNLOAD_CONCURRENCY)
+        # Загрузки стартуют не чаще раза в DOWNLOAD_MIN_INTERVAL_S, чтобы
+        # параллельные запросы из разных чатов не шли к источнику пачкой
+        self._start_lock = asyncio.Lock()
+        self._next_start_at = 0.0
 
     @abstractmethod
     async def search(
@@ -45,11 +68,34 @@ class BaseDownloader(ABC):
     async def download(self, query: str) -> DownloadResult:
         raise NotImplementedError
 
+    async def close(self):
+        """Освобождает долгоживущие ресурсы загрузчика (сессии и т.п.)."""
+        pass
+
+    async def _wait_for_start_slot(self):
+        """Выдерживает минимальный интервал между стартами загрузок."""
+        async with self._start_lock:
+            delay = self._next_start_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start_at = time.monotonic() + self._settings.DOWNLOAD_MIN_INTERVAL_S
+
+    @asynccontextmanager
+    async def _network_slot(self):
+        """
+        Слот для сетевой загрузки: берется в download() только после промаха кэша,
+        поэтому ответы из кэша не ждут ни интервала, ни свободного места.
+        Интервал отсчитывается уже после захвата семафора: иначе загрузки из очереди
+        стартовали бы подряд, как только освободятся слоты.
+        """
+        async with self.semaphore:
+            await self._wait_for_start_slot()
+            yield
+
     async def download_with_retry(self, query: str) -> DownloadResult:
         for attempt in range(self._settings.MAX_RETRIES):
             try:
-                async with self.semaphore:
-                    result = await self.download(query)
+                result = await self.download(query)
                 if result and result.success:
                     return result
                 
@@ -247,6 +293,11 @@ class YouTubeDownloader(BaseDownloader):
         if cached:
             return cached
 
+        async with self._network_slot():
+            return await self._download_uncached(query_or_id, is_id, cache_key)
+
+    async def _download_uncached(self, query_or_id: str, is_id: bool, cache_key: str) -> DownloadResult:
+        """Ищет (если нужно) и скачивает трек с YouTube, сохраняя результат в кэш."""
         try:
             if is_id:
                 track_identifier = query_or_id
@@ -448,8 +499,11 @@ class InternetArchiveDownloader(BaseDownloader):
         max_duration: Optional[int] = None, min_views: Optional[int] = None, 
         min_likes: Optional[int] = None, min_like_ratio: Optional[float] = None
     ) -> List[TrackInfo]:
+        # Фильтр длительности в запрос не передаем: поле length хранится в разных
+        # форматах ("225.3", "3:45"), и диапазон по нему отбросил бы подходящие записи
+        search_query = f'mediatype:audio AND (subject:("{query}") OR title:("{query}"))'
         params = {
-            "q": f'mediatype:audio AND (subject:("{query}") OR title:("{query}"))',
+            "q": search_query,
             "fl[]": "identifier,title,creator,length",
             "rows": limit,
             "page": random.randint(1, 5),
@@ -462,8 +516,9 @@ class InternetArchiveDownloader(BaseDownloader):
             
             results = []
             for doc in data.get("response", {}).get("docs", []):
-                duration = int(float(doc.get("length", 0)))
-                if duration <= 0 or \
+                # Записи с нераспознанной длительностью пропускаются, а не обрывают весь поиск
+                duration = _parse_ia_length(doc.get("length"))
+                if duration is None or duration <= 0 or \
                    (min_duration and duration < min_duration) or \
                    (max_duration and duration > max_duration):
                     continue
@@ -483,7 +538,12 @@ class InternetArchiveDownloader(BaseDownloader):
         cached = await self._cache.get(query, Source.INTERNET_ARCHIVE)
         if cached:
             return cached
-        
+
+        async with self._network_slot():
+            return await self._download_uncached(query)
+
+    async def _download_uncached(self, query: str) -> DownloadResult:
+        """Находит запись в архиве и скачивает ее MP3, сохраняя результат в кэш."""
         search_results = await self.search(query, limit=1)
         if not search_results:
             return DownloadResult(success=False, error="Ничего не найдено.")
@@ -518,5 +578,6 @@ class InternetArchiveDownloader(BaseDownloader):
             return DownloadResult(success=False, error=str(e))
 
     async def close(self):
-        if self._session:
-            await self._session.close()
\ No newline at end of file
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
\ No newline at end of file
@@ -1,15 +1,17 @@
 import asyncio
 import logging
+from typing import Awaitable, Callable, Dict
 
 from telegram import Update, ForceReply, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 from telegram.error import BadRequest
 
+from audio_files import read_audio_file
 from config import Settings
 from keyboards import (
     get_main_menu_keyboard, get_admin_panel_keyboard, get_track_control_keyboard,
-    get_genre_choice_keyboard, get_mood_choice_keyboard
+    get_genre_choice_keyboard, get_mood_choice_keyboard, genre_display_name
 )
 from constants import AdminCallback, MenuCallback, TrackCallback, GenreCallback, VoteCallback, MoodCallback
 from cache_service import CacheService
@@ -36,6 +38,32 @@ class BaseHandler:
         raise NotImplementedError
 
 
+CallbackHandlerFunc = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]]
+
+
+class CallbackQueryRouter:
+    """
+    Единая точка входа для всех callback-запросов.
+    Выбирает обработчик по префиксу callback_data (часть до первого ":")
+    одним поиском в словаре вместо проверки каждого шаблона по очереди.
+    """
+    def __init__(self, routes: Dict[str, CallbackHandlerFunc]):
+        self._routes = routes
+
+    @property
+    def prefixes(self) -> tuple:
+        return tuple(self._routes)
+
+    async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        prefix, _, _ = update.callback_query.data.partition(":")
+        route = self._routes.get(prefix)
+        if route is None:
+            logger.warning(f"Неизвестный callback: {update.callback_query.data}")
+            await update.callback_query.answer()
+            return
+        await route(update, context)
+
+
 class StartHandler(BaseHandler):
     async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(
@@ -114,14 +142,15 @@ class DedicateHandler(BaseHandler):
                     f"✅ `{result.track_info.display_name}`\n\n"
                     f"❤️ {likes}  💔 {dislikes}"
                 )
-                with open(result.file_path, "rb") as audio:
-                    await context.bot.send_audio(
-                        chat_id=update.effective_chat.id, audio=audio,
-                        title=result.track_info.title, performer=result.track_info.artist,
-                        duration=result.track_info.duration, caption=caption,
-                        parse_mode=ParseMode.MARKDOWN,
-                        reply_markup=get_track_control_keyboard(result.track_info.identifier, is_in_favs),
-                    )
+                audio = await read_audio_file(result.file_path)
+                await context.bot.send_audio(
+                    chat_id=update.effective_chat.id, audio=audio,
+                    title=result.track_info.title, performer=result.track_info.artist,
+                    duration=result.track_info.duration, caption=caption,
+                    parse_mode=ParseMode.MARKDOWN,
+                    reply_markup=get_track_control_keyboard(result.track_info.identifier, is_in_favs),
+                    write_timeout=self._settings.UPLOAD_TIMEOUT_S,
+                )
                 await search_msg.delete()
             except Exception as e:
                 logger.error(f"Ошибка при отправке трека-посвящения: {e}", exc_info=True)
@@ -270,8 +299,11 @@ class VoteCallbackHandler(BaseHandler):
         user_id = query.from_user.id
         
         if self._radio.register_vote(genre, user_id):
-            await query.answer(f"✅ Ваш голос за '{genre.capitalize()}' принят!")
-        await query.answer()
+            # Счет в клавиатуре обновляется с задержкой, одной правкой на серию голосов
+            self._radio.update_vote_keyboard()
+            await query.answer(f"✅ Ваш голос за '{genre_display_name(genre)}' принят!")
+        else:
+            await query.answer()
 
 
 class PinHelpMessageHandler(BaseHandler):
@@ -352,14 +384,15 @@ class TrackCallbackHandler(BaseHandler):
                     likes, dislikes = await self._cache.get_ratings(result.track_info.identifier)
                     caption = (f"✅ `{result.track_info.display_name}`\n\n❤️ {likes}  💔 {dislikes}")
                     
-                    with open(result.file_path, "rb") as audio:
-                        await context.bot.send_audio(
-                            chat_id=query.message.chat_id, audio=audio,
-                            title=result.track_info.title, performer=result.track_info.artist,
-                            duration=result.track_info.duration, caption=caption,
-                            parse_mode=ParseMode.MARKDOWN, 
-                            reply_markup=get_track_control_keyboard(result.track_info.identifier, is_in_favs),
-                        )
+                    audio = await read_audio_file(result.file_path)
+                    await context.bot.send_audio(
+                        chat_id=query.message.chat_id, audio=audio,
+                        title=result.track_info.title, performer=result.track_info.artist,
+                        duration=result.track_info.duration, caption=caption,
+                        parse_mode=ParseMode.MARKDOWN, 
+                        reply_markup=get_track_control_keyboard(result.track_info.identifier, is_in_favs),
+                        write_timeout=self._settings.UPLOAD_TIMEOUT_S,
+                    )
                     await query.message.delete()
                 except Exception as e:
                     logger.error(f"Ошибка при отправке файла: {e}", exc_info=True)
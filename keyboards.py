@@ -1,26 +1,41 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Mapping, Tuple
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 from constants import AdminCallback, MenuCallback, TrackCallback, GenreCallback, VoteCallback, MoodCallback
 from config import get_settings
 
 
+@lru_cache(maxsize=256)
+def genre_display_name(name: str) -> str:
+    """Название жанра или настроения для показа пользователю (строка строится один раз)."""
+    return name.capitalize()
+
+
+def _group(buttons: List[InlineKeyboardButton], size: int) -> Tuple[Tuple[InlineKeyboardButton, ...], ...]:
+    """Группирует кнопки в ряды по `size` штук."""
+    return tuple(tuple(buttons[i:i + size]) for i in range(0, len(buttons), size))
+
+
+@lru_cache(maxsize=None)
 def get_main_menu_keyboard(is_admin: bool = False) -> InlineKeyboardMarkup:
     """
     Возвращает главное меню бота с основными действиями.
+    Клавиатуры неизменяемы, поэтому один и тот же объект переиспользуется.
     """
-    keyboard = [
-        [InlineKeyboardButton("🎵 Поиск трека", callback_data=MenuCallback.PLAY_TRACK)],
-        [InlineKeyboardButton("😊 Выбрать настроение", callback_data=MenuCallback.CHOOSE_MOOD)],
-        [InlineKeyboardButton("🗳️ Голосовать за жанр", callback_data=MenuCallback.VOTE_FOR_GENRE)]
-    ]
+    keyboard = (
+        (InlineKeyboardButton("🎵 Поиск трека", callback_data=MenuCallback.PLAY_TRACK),),
+        (InlineKeyboardButton("😊 Выбрать настроение", callback_data=MenuCallback.CHOOSE_MOOD),),
+        (InlineKeyboardButton("🗳️ Голосовать за жанр", callback_data=MenuCallback.VOTE_FOR_GENRE),),
+    )
     if is_admin:
-        keyboard.append(
-            [InlineKeyboardButton("👑 Админ-панель", callback_data=MenuCallback.ADMIN_PANEL)]
+        keyboard += (
+            (InlineKeyboardButton("👑 Админ-панель", callback_data=MenuCallback.ADMIN_PANEL),),
         )
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_admin_panel_keyboard(is_radio_on: bool) -> InlineKeyboardMarkup:
     """
     Возвращает клавиатуру админ-панели.
@@ -30,13 +45,13 @@ def get_admin_panel_keyboard(is_radio_on: bool) -> InlineKeyboardMarkup:
         if is_radio_on
         else InlineKeyboardButton("▶️ Включить радио", callback_data=AdminCallback.RADIO_ON)
     )
-    keyboard = [
-        [radio_button, InlineKeyboardButton("🎶 Сменить жанр", callback_data=AdminCallback.CHANGE_GENRE)],
-        [InlineKeyboardButton("⏭️ Следующий трек", callback_data=AdminCallback.RADIO_SKIP)],
-        [InlineKeyboardButton("🎤 Режим артиста", callback_data=AdminCallback.ARTIST_MODE)],
+    keyboard = (
+        (radio_button, InlineKeyboardButton("🎶 Сменить жанр", callback_data=AdminCallback.CHANGE_GENRE)),
+        (InlineKeyboardButton("⏭️ Следующий трек", callback_data=AdminCallback.RADIO_SKIP),),
+        (InlineKeyboardButton("🎤 Режим артиста", callback_data=AdminCallback.ARTIST_MODE),),
         # Исправлено: кнопка "назад" теперь использует MenuCallback.REFRESH для возврата в главное меню
-        [InlineKeyboardButton("↩️ Назад в меню", callback_data=MenuCallback.REFRESH)],
-    ]
+        (InlineKeyboardButton("↩️ Назад в меню", callback_data=MenuCallback.REFRESH),),
+    )
     return InlineKeyboardMarkup(keyboard)
 
 
@@ -48,48 +63,57 @@ def get_track_control_keyboard(track_id: str, is_in_favorites: bool = False) ->
     """
     add_to_playlist_text = "⭐ В избранном" if is_in_favorites else "➕ В избранное"
     
-    keyboard = [
-        [
+    keyboard = (
+        (
             InlineKeyboardButton("❤️", callback_data=f"{TrackCallback.PREFIX}{TrackCallback.LIKE}:{track_id}"),
             InlineKeyboardButton("💔", callback_data=f"{TrackCallback.PREFIX}{TrackCallback.DISLIKE}:{track_id}"),
             InlineKeyboardButton(add_to_playlist_text, callback_data=f"{TrackCallback.PREFIX}{TrackCallback.ADD_TO_PLAYLIST}:{track_id}"),
             # Кнопка удаления остается простой, т.к. она просто удаляет сообщение
             InlineKeyboardButton("🗑️", callback_data=f"{TrackCallback.PREFIX}{TrackCallback.DELETE}"),
-        ]
-    ]
+        ),
+    )
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_genre_choice_keyboard() -> InlineKeyboardMarkup:
     """
     Создает клавиатуру для выбора жанра радио (для админа).
     """
-    settings = get_settings()
     buttons = [
         InlineKeyboardButton(
-            text=genre.capitalize(), 
+            text=genre_display_name(genre), 
             callback_data=f"{GenreCallback.PREFIX}{genre}"
         ) 
-        for genre in settings.RADIO_GENRES
+        for genre in get_settings().RADIO_GENRES
     ]
     # Группируем кнопки по 3 в ряд
-    keyboard = [buttons[i:i + 3] for i in range(0, len(buttons), 3)]
-    keyboard.append([InlineKeyboardButton("↩️ Назад в админ-панель", callback_data=MenuCallback.ADMIN_PANEL)])
+    keyboard = _group(buttons, 3) + (
+        (InlineKeyboardButton("↩️ Назад в админ-панель", callback_data=MenuCallback.ADMIN_PANEL),),
+    )
     return InlineKeyboardMarkup(keyboard)
 
 
-def get_genre_voting_keyboard(genres_for_voting: List[str], votes: dict = None) -> InlineKeyboardMarkup:
+def get_genre_voting_keyboard(genres_for_voting: List[str], vote_counts: Mapping[str, int] = None) -> InlineKeyboardMarkup:
     """
     Создает клавиатуру для голосования за жанр радио.
     Показывает количество голосов для переданного списка жанров.
+    :param vote_counts: Число голосов по жанрам ({жанр: количество}).
     """
-    if votes is None:
-        votes = {}
+    if vote_counts is None:
+        vote_counts = {}
+
+    genres = tuple(genres_for_voting)
+    counts = tuple(vote_counts.get(genre, 0) for genre in genres)
+    return _genre_voting_keyboard(genres, counts)
+
 
+@lru_cache(maxsize=128)
+def _genre_voting_keyboard(genres: Tuple[str, ...], counts: Tuple[int, ...]) -> InlineKeyboardMarkup:
+    """Клавиатура голосования для заданного счета (одинаковый счет — тот же объект)."""
     buttons = []
-    for genre in genres_for_voting:
-        vote_count = len(votes.get(genre, []))
-        text = f"{genre.capitalize()}"
+    for genre, vote_count in zip(genres, counts):
+        text = genre_display_name(genre)
         if vote_count > 0:
             text += f" [{vote_count}]"
         
@@ -98,38 +122,38 @@ def get_genre_voting_keyboard(genres_for_voting: List[str], votes: dict = None)
         )
 
     # Группируем кнопки по 2 в ряд
-    keyboard = [buttons[i:i + 2] for i in range(0, len(buttons), 2)]
+    keyboard = _group(buttons, 2)
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_mood_choice_keyboard() -> InlineKeyboardMarkup:
     """
     Создает клавиатуру для выбора настроения радио.
     """
-    settings = get_settings()
-    mood_names = list(settings.RADIO_MOODS.keys())
-    
     buttons = [
         InlineKeyboardButton(
-            text=mood.capitalize(), 
+            text=genre_display_name(mood), 
             callback_data=f"{MoodCallback.PREFIX}{mood}"
         ) 
-        for mood in mood_names
+        for mood in get_settings().RADIO_MOODS
     ]
     # Группируем кнопки по 2 в ряд для компактности
-    keyboard = [buttons[i:i + 2] for i in range(0, len(buttons), 2)]
-    keyboard.append([InlineKeyboardButton("↩️ Назад в меню", callback_data=MenuCallback.REFRESH)])
+    keyboard = _group(buttons, 2) + (
+        (InlineKeyboardButton("↩️ Назад в меню", callback_data=MenuCallback.REFRESH),),
+    )
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_voting_in_progress_keyboard() -> InlineKeyboardMarkup:
     """
     Клавиатура, отображаемая, когда пользователь пытается начать голосование, а оно уже идет.
     """
-    keyboard = [
+    keyboard = (
         # В будущем можно добавить кнопку для обновления сообщения с голосованием
-        [InlineKeyboardButton("↩️ Назад в меню", callback_data=MenuCallback.REFRESH)],
-    ]
+        (InlineKeyboardButton("↩️ Назад в меню", callback_data=MenuCallback.REFRESH),),
+    )
     return InlineKeyboardMarkup(keyboard)
 
 
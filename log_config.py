@@ -1,48 +1,89 @@
+import atexit
 import logging
-import logging.config
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
 from config import Settings
 
+LOG_FORMAT = "%(asctime)s - [%(levelname)s] - %(name)s - %(message)s"
+# Место вызова (файл/функция/строка) вычисляется через инспекцию стека
+# на каждую запись, поэтому используем его только в режиме DEBUG
+DEBUG_LOG_FORMAT = (
+    "%(asctime)s - [%(levelname)s] - %(name)s - "
+    "(%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
+)
 
-def setup_logging(settings: Settings):
+# Уровни для «шумных» сторонних библиотек
+THIRD_PARTY_LEVELS = {
+    "httpx": logging.WARNING,
+    "telegram": logging.INFO,
+    "aiosqlite": logging.WARNING,
+}
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(settings: Settings) -> QueueListener:
     """
     Настраивает логирование для приложения.
+    Запись в консоль и файл выполняется в фоновом потоке QueueListener,
+    поэтому вызовы логгера не блокируют цикл событий.
+    Повторные вызовы возвращают уже запущенный listener.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    is_debug = settings.LOG_LEVEL.upper() == "DEBUG"
+    if not is_debug:
+        # Не собираем в LogRecord данные, которые не выводятся в формате
+        logging._srcfile = None
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+    formatter = logging.Formatter(DEBUG_LOG_FORMAT if is_debug else LOG_FORMAT)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    # delay=True: файл открывается только при первой записи, а не при старте
+    file_handler = RotatingFileHandler(
+        settings.LOG_FILE_PATH,
+        maxBytes=10 * 1024 * 1024,  # 10 MB
+        backupCount=5,
+        encoding="utf-8",
+        delay=True,
+    )
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    _listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    # Страховка на случай выхода без явного stop_logging()
+    atexit.register(stop_logging)
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL.upper())
+    root.addHandler(queue_handler)
+
+    # Сторонним логгерам задаем только уровень: записи и так доходят
+    # до корневого логгера, собственный обработчик дублировал бы каждую строку
+    for name, level in THIRD_PARTY_LEVELS.items():
+        logging.getLogger(name).setLevel(level)
+
+    return _listener
+
+
+def stop_logging():
+    """
+    Останавливает фоновый поток логирования, дописав записи из очереди.
+    Повторный вызов ничего не делает: QueueListener.stop() второй раз падает.
     """
-    logging_config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "default": {
-                "format": "%(asctime)s - [%(levelname)s] - %(name)s - "
-                "(%(filename)s).%(funcName)s(%(lineno)d) - %(message)s",
-            },
-        },
-        "handlers": {
-            "default": {
-                "formatter": "default",
-                "class": "logging.StreamHandler",
-                "stream": sys.stdout,
-            },
-            "file": {
-                "formatter": "default",
-                "class": "logging.handlers.RotatingFileHandler",
-                "filename": settings.LOG_FILE_PATH,
-                "maxBytes": 10 * 1024 * 1024,  # 10 MB
-                "backupCount": 5,
-                "encoding": "utf-8",
-            },
-        },
-        "loggers": {
-            "": {  # root logger
-                "handlers": ["default", "file"],
-                "level": settings.LOG_LEVEL.upper(),
-                "propagate": True,
-            },
-            "httpx": {"handlers": ["default", "file"], "level": "WARNING"},
-            "telegram": {"handlers": ["default", "file"], "level": "INFO"},
-            "aiosqlite": {"handlers": ["default", "file"], "level": "WARNING"},
-        },
-    }
-
-    logging.config.dictConfig(logging_config)
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
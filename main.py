@@ -1,10 +1,16 @@
 import asyncio
 import logging
+import re
+import signal
+import sys
+from functools import lru_cache
 
+import aiofiles
 from telegram import BotCommand, BotCommandScopeDefault, BotCommandScopeChat
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters
 
 from handlers import (
+    CallbackQueryRouter,
     AdminCallbackHandler,
     AdminPanelHandler,
     ArtistReplyHandler,
@@ -21,94 +27,234 @@ from handlers import (
     PinHelpMessageHandler,
 )
 from config import Settings, get_settings
-from constants import VoteCallback, GenreCallback, MoodCallback
+from constants import TrackCallback, VoteCallback, GenreCallback, MoodCallback
 from container import create_container
-from log_config import setup_logging
+from log_config import setup_logging, stop_logging
 from radio import RadioService
 from cache_service import CacheService
+from downloaders import BaseDownloader
 
 logger = logging.getLogger(__name__)
 
 
+def _route_key(prefix: str) -> str:
+    """Ключ маршрута: префикс callback_data без завершающего двоеточия."""
+    return prefix.rstrip(":")
+
+
+def install_uvloop() -> bool:
+    """
+    Подключает uvloop в качестве цикла событий, если он установлен.
+    Вызывается до asyncio.run(), поэтому результат логируется уже в main().
+    """
+    if sys.platform == "win32":
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
+
+
+# Команды для обычных пользователей
+DEFAULT_COMMANDS = (
+    BotCommand("start", "🚀 Показать главное меню"),
+    BotCommand("help", "ℹ️ Показать справку"),
+    BotCommand("play", "🎵 Найти и скачать трек"),
+    BotCommand("p", "🎵 Найти и скачать трек"),
+    BotCommand("playlist", "⭐ Показать избранное"),
+    BotCommand("pl", "⭐ Показать избранное"),
+    BotCommand("menu", "🎛️ Показать главное меню"),
+    BotCommand("m", "🎛️ Показать главное меню"),
+    BotCommand("dedicate", "🎧 Посвятить трек пользователю"),
+    BotCommand("d", "🎧 Посвятить трек пользователю"),
+)
+
+# Команды для админов (включают команды по умолчанию)
+ADMIN_COMMANDS = DEFAULT_COMMANDS + (
+    BotCommand("admin", "👑 Открыть панель администратора"),
+    BotCommand("pin_help", "📌 Закрепить сообщение со справкой"),
+)
+
+DEFAULT_SCOPE = BotCommandScopeDefault()
+
+
+@lru_cache(maxsize=None)
+def _admin_scope(admin_id: int) -> BotCommandScopeChat:
+    """Область видимости команд для чата админа (объект создается один раз)."""
+    return BotCommandScopeChat(chat_id=admin_id)
+
+
 async def set_bot_commands(app: Application, settings: Settings):
     """Устанавливает разные списки команд для обычных пользователей и админов."""
-    
-    # Команды для обычных пользователей
-    default_commands = [
-        BotCommand("start", "🚀 Показать главное меню"),
-        BotCommand("help", "ℹ️ Показать справку"),
-        BotCommand("play", "🎵 Найти и скачать трек"),
-        BotCommand("p", "🎵 Найти и скачать трек"),
-        BotCommand("playlist", "⭐ Показать избранное"),
-        BotCommand("pl", "⭐ Показать избранное"),
-        BotCommand("menu", "🎛️ Показать главное меню"),
-        BotCommand("m", "🎛️ Показать главное меню"),
-        BotCommand("dedicate", "🎧 Посвятить трек пользователю"),
-        BotCommand("d", "🎧 Посвятить трек пользователю"),
-    ]
-    
-    # Устанавливаем команды по умолчанию для всех
-    await app.bot.set_my_commands(default_commands, scope=BotCommandScopeDefault())
-
-    # Команды для админов (включают команды по умолчанию)
-    admin_commands = default_commands + [
-        BotCommand("admin", "👑 Открыть панель администратора"),
-        BotCommand("pin_help", "📌 Закрепить сообщение со справкой"),
-    ]
-    
-    # Устанавливаем расширенные команды для каждого админа персонально
-    if settings.ADMIN_ID_LIST:
-        for admin_id in settings.ADMIN_ID_LIST:
-            try:
-                await app.bot.set_my_commands(admin_commands, scope=BotCommandScopeChat(chat_id=admin_id))
-                logger.info(f"✅ Установлены админ-команды для пользователя {admin_id}")
-            except Exception as e:
-                logger.error(f"❌ Не удалось установить команды для админа {admin_id}: {e}")
+    admin_ids = settings.ADMIN_ID_LIST
+
+    # Команды по умолчанию для всех и расширенные команды для каждого админа
+    # персонально: запросы независимы, поэтому отправляем их параллельно
+    results = await asyncio.gather(
+        app.bot.set_my_commands(DEFAULT_COMMANDS, scope=DEFAULT_SCOPE),
+        *(
+            app.bot.set_my_commands(ADMIN_COMMANDS, scope=_admin_scope(admin_id))
+            for admin_id in admin_ids
+        ),
+        return_exceptions=True,
+    )
 
-def main() -> None:
+    default_result, admin_results = results[0], results[1:]
+    if isinstance(default_result, Exception):
+        logger.error(f"❌ Не удалось установить команды по умолчанию: {default_result}")
+
+    for admin_id, result in zip(admin_ids, admin_results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ Не удалось установить команды для админа {admin_id}: {result}")
+        else:
+            logger.info(f"✅ Установлены админ-команды для пользователя {admin_id}")
+
+
+async def write_cookies_file(settings: Settings):
+    """
+    Создает cookies.txt из переменной окружения.
+    Если файл уже содержит то же самое, повторная запись пропускается.
+    """
+    path = settings.COOKIES_FILE
+    # Сравниваем байты: в текстовом режиме перевод строк "\r\n" менял бы содержимое
+    content = settings.COOKIES_CONTENT.encode("utf-8")
+    try:
+        try:
+            async with aiofiles.open(path, "rb") as f:
+                if await f.read() == content:
+                    logger.info("Файл cookies.txt актуален, перезапись не требуется.")
+                    return
+        except OSError:
+            # Файла нет или его не удалось прочитать — просто перезаписываем
+            pass
+
+        async with aiofiles.open(path, "wb") as f:
+            await f.write(content)
+        logger.info("✅ Файл cookies.txt успешно создан из переменной окружения.")
+    except Exception as e:
+        logger.error(f"❌ Не удалось создать cookies.txt: {e}")
+
+
+async def main(uvloop_enabled: bool = False) -> None:
     """Основная функция запуска бота."""
     settings = get_settings()
     setup_logging(settings)
 
-    if settings.COOKIES_CONTENT:
-        try:
-            settings.COOKIES_FILE.write_text(settings.COOKIES_CONTENT)
-            logger.info("✅ Файл cookies.txt успешно создан из переменной окружения.")
-        except Exception as e:
-            logger.error(f"❌ Не удалось создать cookies.txt: {e}")
-
     logger.info("🚀 Запуск Music Bot v4.1...")
+    if uvloop_enabled:
+        logger.info("✅ Используется цикл событий uvloop.")
 
-    app = Application.builder().token(settings.BOT_TOKEN).build()
+    # HTTP/2 включается только явно (TELEGRAM_HTTP_VERSION=2): по документации PTB
+    # он нестабилен, когда запросы отменяются, а радио отменяет их регулярно.
+    # Для long polling остается HTTP/1.1 — у getUpdates свое соединение.
+    app = (
+        Application.builder()
+        .token(settings.BOT_TOKEN)
+        .http_version(settings.TELEGRAM_HTTP_VERSION)
+        .build()
+    )
     container = create_container(app.bot)
 
+    # --- Получение обработчиков из контейнера (один раз) ---
+    start_h = container.resolve(StartHandler)
+    play_h = container.resolve(PlayHandler)
+    dedicate_h = container.resolve(DedicateHandler)
+    admin_panel_h = container.resolve(AdminPanelHandler)
+    pin_help_h = container.resolve(PinHelpMessageHandler)
+    playlist_h = container.resolve(PlaylistHandler)
+    artist_reply_h = container.resolve(ArtistReplyHandler)
+    admin_cb_h = container.resolve(AdminCallbackHandler)
+    menu_cb_h = container.resolve(MenuCallbackHandler)
+    track_cb_h = container.resolve(TrackCallbackHandler)
+    vote_cb_h = container.resolve(VoteCallbackHandler)
+    genre_cb_h = container.resolve(GenreCallbackHandler)
+    mood_cb_h = container.resolve(MoodCallbackHandler)
+    cache_service = container.resolve(CacheService)
+    radio_service = container.resolve(RadioService)
+    downloader = container.resolve(BaseDownloader)
+
     # --- Регистрация обработчиков ---
-    app.add_handler(CommandHandler(["start", "help", "menu", "m"], container.resolve(StartHandler).handle))
-    app.add_handler(CommandHandler(["play", "p"], container.resolve(PlayHandler).handle))
-    app.add_handler(CommandHandler(["dedicate", "d"], container.resolve(DedicateHandler).handle))
-    app.add_handler(CommandHandler(["admin"], container.resolve(AdminPanelHandler).handle))
-    app.add_handler(CommandHandler(["pin_help"], container.resolve(PinHelpMessageHandler).handle))
-    app.add_handler(CommandHandler(["playlist", "pl"], container.resolve(PlaylistHandler).handle))
-    
-    # Обработчик для ответов на сообщения (для режима артиста)
-    app.add_handler(MessageHandler(filters.REPLY, container.resolve(ArtistReplyHandler).handle))
-
-    app.add_handler(CallbackQueryHandler(container.resolve(AdminCallbackHandler).handle, pattern="^admin:.*"))
-    app.add_handler(CallbackQueryHandler(container.resolve(MenuCallbackHandler).handle, pattern="^menu:.*"))
-    app.add_handler(CallbackQueryHandler(container.resolve(TrackCallbackHandler).handle, pattern="^track:.*"))
-    app.add_handler(CallbackQueryHandler(container.resolve(VoteCallbackHandler).handle, pattern=f"^{VoteCallback.PREFIX}.*"))
-    app.add_handler(CallbackQueryHandler(container.resolve(GenreCallbackHandler).handle, pattern=f"^{GenreCallback.PREFIX}.*"))
-    app.add_handler(CallbackQueryHandler(container.resolve(MoodCallbackHandler).handle, pattern=f"^{MoodCallback.PREFIX}.*"))
-
-    async def post_init(application: Application) -> None:
-        await set_bot_commands(application, settings)
-        cache_service = container.resolve(CacheService)
-        await cache_service.initialize()
+    app.add_handler(CommandHandler(["start", "help", "menu", "m"], start_h.handle))
+    app.add_handler(CommandHandler(["play", "p"], play_h.handle))
+    app.add_handler(CommandHandler(["dedicate", "d"], dedicate_h.handle))
+    app.add_handler(CommandHandler(["admin"], admin_panel_h.handle))
+    app.add_handler(CommandHandler(["pin_help"], pin_help_h.handle))
+    app.add_handler(CommandHandler(["playlist", "pl"], playlist_h.handle))
     
-    app.post_init = post_init
-    
-    app.run_polling(drop_pending_updates=True)
+    # Обработчик для ответов на сообщения (для режима артиста).
+    # Ответы интересны только от админов и только текстовые — остальные
+    # сообщения в группе отсеиваются фильтром, не доходя до обработчика.
+    artist_reply_filter = filters.REPLY & filters.TEXT & filters.User(user_id=settings.ADMIN_ID_LIST)
+    app.add_handler(MessageHandler(artist_reply_filter, artist_reply_h.handle))
+
+    # Все callback-запросы идут через один обработчик с маршрутизацией по префиксу
+    callback_router = CallbackQueryRouter({
+        "admin": admin_cb_h.handle,
+        "menu": menu_cb_h.handle,
+        _route_key(TrackCallback.PREFIX): track_cb_h.handle,
+        _route_key(VoteCallback.PREFIX): vote_cb_h.handle,
+        _route_key(GenreCallback.PREFIX): genre_cb_h.handle,
+        _route_key(MoodCallback.PREFIX): mood_cb_h.handle,
+    })
+    callback_pattern = re.compile(
+        "^(?:" + "|".join(re.escape(p) for p in callback_router.prefixes) + "):"
+    )
+    app.add_handler(CallbackQueryHandler(callback_router.handle, pattern=callback_pattern))
+
+    try:
+        async with app:
+            # Независимые операции запуска выполняем параллельно.
+            # app.start() ждет инициализации кэша: обработчикам нужны таблицы БД.
+            startup_tasks = [
+                set_bot_commands(app, settings),
+                cache_service.initialize(),
+            ]
+            if settings.COOKIES_CONTENT:
+                startup_tasks.append(write_cookies_file(settings))
+            await asyncio.gather(*startup_tasks)
+
+            stop_event = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, stop_event.set)
+                except NotImplementedError:
+                    # Windows: остается стандартная обработка KeyboardInterrupt
+                    pass
+
+            await app.start()
+            await app.updater.start_polling(drop_pending_updates=True)
+            try:
+                await stop_event.wait()
+                logger.info("Получен сигнал остановки.")
+            finally:
+                # Радио останавливаем, пока HTTP-клиент бота еще работает:
+                # иначе не удалятся сообщения о голосовании и статусе
+                try:
+                    await radio_service.stop()
+                except Exception as e:
+                    logger.error(f"Ошибка при остановке радио: {e}")
+                await app.updater.stop()
+                await app.stop()
+    finally:
+        # Сервисы независимы, поэтому закрываем их параллельно
+        results = await asyncio.gather(
+            cache_service.close(),
+            downloader.close(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка при остановке сервиса: {result}")
+        logger.info("👋 Бот остановлен.")
+        stop_logging()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    uvloop_enabled = install_uvloop()
+    try:
+        asyncio.run(main(uvloop_enabled))
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
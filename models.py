@@ -1,9 +1,9 @@
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import asdict, dataclass
+from enum import StrEnum
 from typing import Optional
 
 
-class Source(str, Enum):
+class Source(StrEnum):
     """Перечисление доступных источников музыки."""
     YOUTUBE = "YouTube"
     YOUTUBE_MUSIC = "YouTube Music"
@@ -19,21 +19,24 @@ class DownloadResult:
     file_path: Optional[str] = None
     track_info: Optional["TrackInfo"] = None
     error: Optional[str] = None
+    # file_id уже загруженного в Telegram аудио: если задан, файл не нужен
+    telegram_file_id: Optional[str] = None
 
     def to_dict(self) -> dict:
         """Сериализует объект в словарь для сохранения в JSON."""
         return {
             "success": self.success,
             "file_path": self.file_path,
-            "track_info": self.track_info.__dict__ if self.track_info else None,
+            "track_info": asdict(self.track_info) if self.track_info else None,
             "error": self.error,
         }
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TrackInfo:
     """
     Структура для хранения информации о треке.
-    `frozen=True` делает экземпляры класса неизменяемыми.
+    `frozen=True` делает экземпляры класса неизменяемыми,
+    `slots=True` убирает `__dict__` у каждого экземпляра.
     """
     title: str
     artist: str
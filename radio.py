@@ -1,22 +1,118 @@
 import asyncio
+import json
 import logging
 import random
-import os
-from datetime import datetime, timedelta
-from typing import Optional, Set, Dict, Tuple, List
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import asdict
+from functools import lru_cache
+from typing import Deque, Optional, Set, Dict, Tuple, List
 
-from telegram import Bot, InlineKeyboardMarkup
+import aiofiles
+import aiofiles.os
+from telegram import Bot, InlineKeyboardMarkup, Message
 from telegram.constants import ParseMode
-from telegram.error import TelegramError
+from telegram.error import BadRequest, TelegramError
 
+from audio_files import read_audio_file
 from config import Settings
 from models import DownloadResult, TrackInfo
 from downloaders import BaseDownloader
+from cache_service import CacheService
 # get_track_control_keyboard будет использоваться для сообщений о голосовании
-from keyboards import get_track_control_keyboard, get_genre_voting_keyboard, get_voting_in_progress_keyboard
+from keyboards import (
+    genre_display_name,
+    get_track_control_keyboard,
+    get_genre_voting_keyboard,
+    get_voting_in_progress_keyboard,
+)
 
 logger = logging.getLogger(__name__)
 
+# Шаблоны поисковых запросов для радио
+QUERY_TEMPLATES = (
+    "{genre}",
+    "{genre} music",
+    "best {genre} mix",
+    "relaxing {genre} playlist",
+    "{genre} hits",
+    "deep {genre}",
+)
+ARTIST_QUERY_TEMPLATES = (
+    "{artist}",
+    "{artist} songs",
+    "{artist} playlist",
+    "best of {artist}",
+)
+
+# Подпись к треку радио: шаблон собирается один раз, в цикле только подставляются значения
+CAPTION_TEMPLATE = (
+    "📻 **Groove AI Radio**\n"
+    "{mode_icon} **Режим:** `{mode_name}`\n\n"
+    "🎧 **Трек:** `{title}`\n"
+    "👤 **Исполнитель:** `{artist}`\n"
+    "⏳ **Длительность:** `{duration}`"
+)
+
+# Модификаторы запроса для разнообразия; None заменяется случайным недавним годом
+YEAR_MODIFIERS = ("", None, "90s", "80s")
+
+# Длительность режима (жанр, настроение, артист) до следующего голосования, в секундах
+MODE_DURATION_S = 30 * 60
+
+# Время жизни кэша результатов поиска для радио, в секундах, и его размер.
+# Кэш очищается при смене режима, поэтому живет не дольше самого режима
+SEARCH_CACHE_TTL_S = MODE_DURATION_S
+SEARCH_CACHE_MAX = 64
+
+# Пока идет голосование, следующее не начинается: 3 минуты на голоса и запас на итоги.
+# Окончательный срок режима выставляют итоги голосования или выбор админа
+VOTE_GRACE_S = 8 * 60
+
+# Сколько новых треков максимум добавляется в плейлист за одно пополнение
+PLAYLIST_BATCH_MAX = 30
+
+# Треки, которые не удалось скачать, пропускаются в течение часа (не более 256 записей)
+FAILED_TRACK_TTL_S = 3600
+FAILED_TRACKS_MAX = 256
+
+# Минимальный интервал между сообщениями и правками бота в одном чате, в секундах:
+# Telegram ограничивает частоту отправки в чат и отвечает 429 при превышении
+CHAT_SEND_MIN_INTERVAL_S = 1.0
+
+# Голосование завершается досрочно, когда за один жанр набрано столько голосов
+VOTE_QUORUM = 10
+
+# Голоса, поданные за это время (в секундах), попадают в одну правку клавиатуры голосования
+VOTE_KEYBOARD_DEBOUNCE_S = 0.5
+
+# Сколько секунд stop() ждет завершения фоновых задач
+BACKGROUND_STOP_TIMEOUT_S = 10
+
+# Фрагменты текста BadRequest, по которым видно, что Telegram не принял сам file_id
+STALE_FILE_ID_MARKERS = ("wrong file identifier", "file_id", "file reference")
+
+# Потолок экспоненциальной задержки после ошибок подряд, в секундах
+MAX_ERROR_BACKOFF_S = 300
+
+
+@lru_cache(maxsize=256)
+def _genre_queries(genre: str) -> Tuple[str, ...]:
+    """Поисковые запросы для жанра: собираются при первом обращении и переиспользуются."""
+    return tuple(template.format(genre=genre) for template in QUERY_TEMPLATES)
+
+
+@lru_cache(maxsize=64)
+def _artist_queries(artist: str) -> Tuple[str, ...]:
+    """Поисковые запросы для режима артиста."""
+    return tuple(template.format(artist=artist) for template in ARTIST_QUERY_TEMPLATES)
+
+
+def _is_stale_file_id_error(error: BadRequest) -> bool:
+    """Отклонил ли Telegram сам file_id, а не другие параметры запроса."""
+    message = str(error).lower()
+    return any(marker in message for marker in STALE_FILE_ID_MARKERS)
+
 
 class RadioService:
     """
@@ -24,35 +120,77 @@ class RadioService:
     с системой голосования и режимом артиста.
     """
 
-    def __init__(self, settings: Settings, bot: Bot, downloader: BaseDownloader):
+    def __init__(self, settings: Settings, bot: Bot, downloader: BaseDownloader, cache_service: CacheService):
         self._settings = settings
         self._bot = bot
         self._downloader = downloader
+        self._cache = cache_service
         
         # --- Состояние радио ---
         self._task: Optional[asyncio.Task] = None
         self._is_on = False
+        # Запрос пропуска: прерывает паузу между треками, а если пришел во время
+        # скачивания или отправки — паузы после этого трека не будет вовсе
         self._skip_event = asyncio.Event()
         self.error_count = 0
         self._fetch_failure_count = 0
         
         # --- Состояние плейлиста ---
-        self._playlist: list[TrackInfo] = []
+        # Треки перемешиваются при добавлении, поэтому берутся по порядку с начала
+        self._playlist: Deque[TrackInfo] = deque()
+        # Растет при каждой смене режима: поиск, начатый до смены, не пополняет новый плейлист
+        self._playlist_generation = 0
+        # История сыгранных треков: set для быстрой проверки, deque хранит порядок,
+        # чтобы при переполнении вытеснять самый старый трек, а не случайный
         self._played_ids: Set[str] = set()
+        self._played_order: Deque[str] = deque()
+        # Следующий трек, который скачивается заранее, пока играет текущий,
+        # вместе с режимом радио, для которого он был выбран
+        self._prefetch: Optional[Tuple[TrackInfo, asyncio.Task, List[Optional[str]]]] = None
+        # Значок и название режима для подписи и режим, для которого они посчитаны
+        self._mode_label: Tuple[str, str] = ("", "")
+        self._mode_label_key: Optional[List[Optional[str]]] = None
+        # Сообщение со статусом ("Скачиваю...") и его последний текст
+        self._status_message: Optional[Message] = None
+        self._last_status_text: Optional[str] = None
+        # Ограничение частоты отправки: {chat_id: время последней отправки}
+        self._chat_last_send: Dict[int, float] = {}
+        self._chat_send_locks: Dict[int, asyncio.Lock] = {}
+        # Фоновые задачи (например, удаление статуса), которые дожидаются при остановке
+        self._background_tasks: Set[asyncio.Task] = set()
+        # {запрос: (время поиска, найденные треки)}, давно не использованные — в начале
+        self._search_cache: "OrderedDict[str, Tuple[float, Tuple[TrackInfo, ...]]]" = OrderedDict()
+        # {ID трека: время неудачной загрузки}, самые старые записи в начале
+        self._failed_tracks: "OrderedDict[str, float]" = OrderedDict()
 
         # --- Состояние режимов (голосование/артист) ---
         self.artist_mode: Optional[str] = None
         self.winning_genre: str = "rock"  # Начинаем с рока по умолчанию
         self.current_mood: Optional[str] = None # Новое поле для текущего настроения
-        self.mode_end_time: Optional[datetime] = None
+        # Момент окончания режима по time.monotonic(): не зависит от перевода системных часов
+        self.mode_end_time: Optional[float] = None
 
         # --- Состояние голосования ---
         self._vote_in_progress: bool = False
-        self._votes: Dict[str, Set[int]] = {} # {genre: {user_id_1, user_id_2}}
+        # Голос каждого пользователя и число голосов за жанр обновляются
+        # вместе, поэтому смена голоса не требует обхода всех жанров
+        self._user_votes: Dict[int, str] = {}  # {user_id: genre}
+        self._vote_tally: Counter = Counter()  # {genre: число голосов}
         self._current_vote_genres: List[str] = []
+        # Число голосов по жанрам, показанное в клавиатуре голосования сейчас
+        self._last_vote_snapshot: Optional[Tuple[int, ...]] = None
+        # Отложенная правка клавиатуры голосования, если она уже запланирована
+        self._vote_keyboard_task: Optional[asyncio.Task] = None
         # ID сообщения, в котором идет голосование (отдельно от статуса)
         self.current_vote_message_info: Optional[Tuple[int, int]] = None 
         self._vote_task: Optional[asyncio.Task] = None
+        # Прерывает ожидание конца голосования (отмена админом или остановка радио)
+        self._vote_cancel_event = asyncio.Event()
+        # Подводит итоги голосования сразу, не дожидаясь таймера (набран кворум)
+        self._vote_finish_event = asyncio.Event()
+        # Общая блокировка для подведения итогов и отмены голосования
+        self._vote_lock = asyncio.Lock()
+
 
     @property
     def is_on(self) -> bool:
@@ -72,16 +210,18 @@ class RadioService:
         self._is_on = True
         self._skip_event.clear()
         self.error_count = 0
-        self._playlist = []
-        self._played_ids = set()
-        self._fetch_failure_count = 0
+        self._reset_playlist()
+        self._played_ids.clear()
+        self._played_order.clear()
+        await self._load_playlist()
 
         if self.current_mood or self.winning_genre != "rock" or self.artist_mode:
-            self.mode_end_time = datetime.now() + timedelta(minutes=30)
+            self.mode_end_time = time.monotonic() + MODE_DURATION_S
         else:
             self.mode_end_time = None
 
-        self._task = asyncio.create_task(self._radio_loop(chat_id))
+        # Через _spawn, как и остальные фоновые задачи: падение цикла не пройдет незамеченным
+        self._task = self._spawn(self._radio_loop(chat_id))
         logger.info(f"✅ Радио-задача создана и запущена для чата {chat_id}.")
 
     async def stop(self):
@@ -94,11 +234,15 @@ class RadioService:
             except asyncio.CancelledError:
                 pass
             self._task = None
+            # Оставшийся плейлист и история переживут перезапуск
+            await self._save_playlist()
         
+        self._vote_in_progress = False
         if self._vote_task:
-            self._vote_task.cancel()
+            self._vote_cancel_event.set()
+            await asyncio.gather(self._vote_task, return_exceptions=True)
             self._vote_task = None
-        
+
         if self.current_vote_message_info:
             try:
                 await self._bot.delete_message(self.current_vote_message_info[0], self.current_vote_message_info[1])
@@ -106,6 +250,11 @@ class RadioService:
                 pass
             self.current_vote_message_info = None
 
+        # Даем завершиться фоновым запросам (удаление статуса, отброшенная
+        # предзагрузка и т.п.), но не дольше BACKGROUND_STOP_TIMEOUT_S
+        if self._background_tasks:
+            await asyncio.wait(set(self._background_tasks), timeout=BACKGROUND_STOP_TIMEOUT_S)
+
         logger.info("⏹️ Радио остановлено.")
 
     async def skip(self):
@@ -116,36 +265,43 @@ class RadioService:
     # --- Управление режимами ---
     async def set_admin_genre(self, genre: str, chat_id: int):
         """Принудительно устанавливает жанр админом."""
-        self.winning_genre = genre
-        self.artist_mode = None
-        self.current_mood = None
-        self.mode_end_time = datetime.now() + timedelta(minutes=30)
-        self._playlist = []
-        self._fetch_failure_count = 0
+        # Под блокировкой: если итоги голосования уже подводятся, жанр админа
+        # устанавливается после них, а сообщение о голосовании не правится дважды
+        async with self._vote_lock:
+            self.winning_genre = genre
+            self.artist_mode = None
+            self.current_mood = None
+            self.mode_end_time = time.monotonic() + MODE_DURATION_S
+            self._reset_playlist()
 
-        if self._vote_task:
-            self._vote_task.cancel()
-            self._vote_task = None
+            if self._vote_task:
+                # Задача голосования завершится сама, не дожидаясь таймера;
+                # отмена задачи — на случай, если она еще не начала работу
+                self._vote_cancel_event.set()
+                self._vote_task.cancel()
+                self._vote_task = None
 
-        if self.current_vote_message_info:
-            try:
-                chat_id_vote, msg_id_vote = self.current_vote_message_info
-                await self._bot.edit_message_text(
-                    chat_id=chat_id_vote,
-                    message_id=msg_id_vote,
-                    text=f"🗳️ Голосование отменено.\nАдмин установил жанр: **{genre.capitalize()}**",
-                    parse_mode=ParseMode.MARKDOWN,
-                    reply_markup=None
-                )
-            except TelegramError as e:
-                logger.warning(f"Не удалось изменить сообщение о голосовании: {e}")
-            self.current_vote_message_info = None
+            if self.current_vote_message_info:
+                try:
+                    chat_id_vote, msg_id_vote = self.current_vote_message_info
+                    await self._throttle(chat_id_vote)
+                    await self._bot.edit_message_text(
+                        chat_id=chat_id_vote,
+                        message_id=msg_id_vote,
+                        text=f"🗳️ Голосование отменено.\nАдмин установил жанр: **{genre_display_name(genre)}**",
+                        parse_mode=ParseMode.MARKDOWN,
+                        reply_markup=None
+                    )
+                except TelegramError as e:
+                    logger.warning(f"Не удалось изменить сообщение о голосовании: {e}")
+                self.current_vote_message_info = None
 
-        self._vote_in_progress = False
-        
+            self._vote_in_progress = False
+
+        await self._throttle(chat_id)
         await self._bot.send_message(
             chat_id,
-            f"✅ Жанр принудительно изменен на **{genre.capitalize()}**. Этот жанр будет играть следующий час.",
+            f"✅ Жанр принудительно изменен на **{genre_display_name(genre)}**. Этот жанр будет играть следующий час.",
             parse_mode=ParseMode.MARKDOWN,
         )
         logger.info(f"[Режим] Админ установил жанр: {genre} на 1 час.")
@@ -155,9 +311,8 @@ class RadioService:
         self.artist_mode = artist
         self.winning_genre = None
         self.current_mood = None
-        self.mode_end_time = datetime.now() + timedelta(minutes=30)
-        self._playlist = []
-        self._fetch_failure_count = 0
+        self.mode_end_time = time.monotonic() + MODE_DURATION_S
+        self._reset_playlist()
         logger.info(f"[Режим] Включен режим артиста: {artist} на 1 час.")
         
         await self.skip()
@@ -170,13 +325,13 @@ class RadioService:
         self.current_mood = mood
         self.artist_mode = None
         self.winning_genre = None
-        self.mode_end_time = datetime.now() + timedelta(minutes=30)
-        self._playlist = []
-        self._fetch_failure_count = 0
-        
+        self.mode_end_time = time.monotonic() + MODE_DURATION_S
+        self._reset_playlist()
+
+        await self._throttle(chat_id)
         await self._bot.send_message(
             chat_id,
-            f"✅ Установлено настроение: **{mood.capitalize()}**. "
+            f"✅ Установлено настроение: **{genre_display_name(mood)}**. "
             f"Следующий час бот будет подбирать музыку под это настроение!",
             parse_mode=ParseMode.MARKDOWN,
         )
@@ -192,19 +347,25 @@ class RadioService:
 
         logger.info("[Голосование] Начинается голосование за жанр.")
         self._vote_in_progress = True
-        self._votes = {}
+        self._user_votes = {}
+        self._vote_tally = Counter()
         self.artist_mode = None
         self.current_mood = None
 
         all_genres = self._settings.RADIO_GENRES
         sample_size = min(len(all_genres), 16)
-        self._current_vote_genres = sorted(random.sample(all_genres, sample_size))
+        # random.sample возвращает новый список, его можно сортировать на месте
+        vote_genres = random.sample(all_genres, sample_size)
+        vote_genres.sort()
+        self._current_vote_genres = vote_genres
+        self._last_vote_snapshot = self._vote_snapshot()
 
         try:
+            await self._throttle(chat_id)
             vote_message = await self._bot.send_message(
                 chat_id=chat_id,
                 text="📢 **Началось голосование за жанр!**\n\nВыберите, что будет играть следующий час. Голосование продлится 5 минут.",
-                reply_markup=get_genre_voting_keyboard(self._current_vote_genres, self._votes),
+                reply_markup=get_genre_voting_keyboard(self._current_vote_genres, self._vote_tally),
                 parse_mode=ParseMode.MARKDOWN,
             )
             self.current_vote_message_info = (chat_id, vote_message.message_id)
@@ -213,7 +374,18 @@ class RadioService:
             self._vote_in_progress = False
             return
 
-        await asyncio.sleep(180)  # 3 минуты на голосование
+        # 3 минуты на голосование; отмена или кворум прерывают ожидание сразу
+        waiters = (
+            asyncio.ensure_future(self._vote_cancel_event.wait()),
+            asyncio.ensure_future(self._vote_finish_event.wait()),
+        )
+        try:
+            await asyncio.wait(waiters, timeout=180, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        if self._vote_cancel_event.is_set():
+            return
         if self._vote_in_progress:
             await self.end_genre_vote(chat_id)
 
@@ -222,33 +394,74 @@ class RadioService:
         if self._vote_task and not self._vote_task.done():
             logger.warning("[Голосование] Попытка запустить голосование, когда оно уже идет.")
             return
-        self._vote_task = asyncio.create_task(self._run_vote_lifecycle(chat_id))
+        # События сбрасываются до запуска задачи: отмена, пришедшая до ее первого шага,
+        # не должна потеряться
+        self._vote_cancel_event.clear()
+        self._vote_finish_event.clear()
+        # Через _spawn: задача учитывается среди фоновых, а ее ошибка попадет в лог
+        self._vote_task = self._spawn(self._run_vote_lifecycle(chat_id))
+        # Если сообщение о голосовании не отправится, следующая попытка будет не раньше
+        self.mode_end_time = time.monotonic() + VOTE_GRACE_S
 
 
     def register_vote(self, genre: str, user_id: int) -> bool:
         if not self._vote_in_progress:
             return False
         
-        for g in self._votes:
-            self._votes[g].discard(user_id)
-            
-        if genre not in self._votes:
-            self._votes[genre] = set()
-        self._votes[genre].add(user_id)
+        previous = self._user_votes.get(user_id)
+        if previous == genre:
+            return True
+        if previous is not None:
+            self._vote_tally[previous] -= 1
+            if not self._vote_tally[previous]:
+                del self._vote_tally[previous]
+
+        self._user_votes[user_id] = genre
+        self._vote_tally[genre] += 1
         
         logger.debug(f"[Голосование] Пользователь {user_id} проголосовал за {genre}.")
+        if self._vote_tally[genre] >= VOTE_QUORUM and not self._vote_finish_event.is_set():
+            logger.info(f"[Голосование] Жанр {genre} набрал {VOTE_QUORUM} голосов, подвожу итоги досрочно.")
+            self._vote_finish_event.set()
         return True
 
-    async def update_vote_keyboard(self):
+    def _vote_snapshot(self) -> Tuple[int, ...]:
+        """Число голосов за каждый жанр голосования в порядке кнопок."""
+        tally = self._vote_tally
+        return tuple(tally[genre] for genre in self._current_vote_genres)
+
+    def update_vote_keyboard(self):
+        """
+        Планирует обновление счета в клавиатуре голосования. Правка отправляется
+        через VOTE_KEYBOARD_DEBOUNCE_S и отражает все голоса, поданные за это время.
+        """
         if not self._vote_in_progress or not self.current_vote_message_info:
             return
-        
+        if self._vote_keyboard_task is not None:
+            return
+        self._vote_keyboard_task = self._spawn(self._update_vote_keyboard_later())
+
+    async def _update_vote_keyboard_later(self):
+        try:
+            await asyncio.sleep(VOTE_KEYBOARD_DEBOUNCE_S)
+        finally:
+            self._vote_keyboard_task = None
+        if not self._vote_in_progress or not self.current_vote_message_info:
+            return
+
+        # Если счет не изменился, клавиатура та же: не тратим запрос к Telegram
+        snapshot = self._vote_snapshot()
+        if snapshot == self._last_vote_snapshot:
+            return
+        self._last_vote_snapshot = snapshot
+
         chat_id, message_id = self.current_vote_message_info
         try:
+            await self._throttle(chat_id)
             await self._bot.edit_message_reply_markup(
                 chat_id=chat_id,
                 message_id=message_id,
-                reply_markup=get_genre_voting_keyboard(self._current_vote_genres, self._votes)
+                reply_markup=get_genre_voting_keyboard(self._current_vote_genres, self._vote_tally)
             )
         except TelegramError as e:
             if "not modified" not in str(e):
@@ -256,37 +469,39 @@ class RadioService:
 
 
     async def end_genre_vote(self, chat_id: int):
-        if not self.current_vote_message_info:
-            return
+        # Под блокировкой: итоги не подводятся одновременно с отменой голосования админом
+        async with self._vote_lock:
+            if not self.current_vote_message_info:
+                return
 
-        logger.info("[Голосование] Голосование завершено. Подвожу итоги.")
+            logger.info("[Голосование] Голосование завершено. Подвожу итоги.")
         
-        if self._votes:
-            winner = max(self._votes, key=lambda g: len(self._votes[g]))
-            self.winning_genre = winner
-        else:
-            self.winning_genre = random.choice(self._current_vote_genres)
+            if self._vote_tally:
+                winner, _ = self._vote_tally.most_common(1)[0]
+                self.winning_genre = winner
+            else:
+                self.winning_genre = random.choice(self._current_vote_genres)
         
-        self.mode_end_time = datetime.now() + timedelta(minutes=30)
-        self._playlist = []
-        self._fetch_failure_count = 0
+            self.mode_end_time = time.monotonic() + MODE_DURATION_S
+            self._reset_playlist()
         
-        announcement = f"🎉 **Голосование завершено!**\n\nСледующий час играет: **{self.winning_genre.capitalize()}**"
-        logger.info(f"[Режим] По результатам голосования установлен жанр: {self.winning_genre}")
+            announcement = f"🎉 **Голосование завершено!**\n\nСледующий час играет: **{genre_display_name(self.winning_genre)}**"
+            logger.info(f"[Режим] По результатам голосования установлен жанр: {self.winning_genre}")
 
-        chat_id_vote, msg_id_vote = self.current_vote_message_info
-        try:
-            await self._bot.edit_message_text(
-                chat_id=chat_id_vote, message_id=msg_id_vote,
-                text=announcement, parse_mode=ParseMode.MARKDOWN, reply_markup=None
-            )
-        except TelegramError as e:
-            logger.warning(f"Не удалось обновить сообщение о голосовании результатами: {e}")
+            chat_id_vote, msg_id_vote = self.current_vote_message_info
+            try:
+                await self._throttle(chat_id_vote)
+                await self._bot.edit_message_text(
+                    chat_id=chat_id_vote, message_id=msg_id_vote,
+                    text=announcement, parse_mode=ParseMode.MARKDOWN, reply_markup=None
+                )
+            except TelegramError as e:
+                logger.warning(f"Не удалось обновить сообщение о голосовании результатами: {e}")
 
-        # Сбрасываем состояние голосования
-        self.current_vote_message_info = None
-        self._vote_in_progress = False
-        self._vote_task = None
+            # Сбрасываем состояние голосования
+            self.current_vote_message_info = None
+            self._vote_in_progress = False
+            self._vote_task = None
 
         await self.skip()
 
@@ -296,12 +511,7 @@ class RadioService:
         """Генерирует более разнообразные поисковые запросы."""
         if self.artist_mode:
             # Для режима артиста можно добавить вариативности
-            return random.choice([
-                self.artist_mode,
-                f"{self.artist_mode} songs",
-                f"{self.artist_mode} playlist",
-                f"best of {self.artist_mode}",
-            ])
+            return random.choice(_artist_queries(self.artist_mode))
 
         base_genre = "rock"
         if self.current_mood:
@@ -310,111 +520,468 @@ class RadioService:
         elif self.winning_genre:
             base_genre = self.winning_genre
 
-        # Шаблоны и модификаторы для разнообразия
-        query_templates = [
-            "{genre}",
-            "{genre} music",
-            "best {genre} mix",
-            "relaxing {genre} playlist",
-            "{genre} hits",
-            "deep {genre}",
-        ]
-        year_modifiers = ["", f"{random.randint(2010, 2024)}", "90s", "80s"]
-        
-        template = random.choice(query_templates)
-        query = template.format(genre=base_genre)
-        
-        # С шансом 30% добавляем модификатор
+        query = random.choice(_genre_queries(base_genre))
+
+        # С шансом 30% добавляем модификатор; случайный год выбирается, только если выпал он
         if random.random() < 0.3:
-            modifier = random.choice(year_modifiers)
+            modifier = random.choice(YEAR_MODIFIERS)
+            if modifier is None:
+                modifier = str(random.randint(2010, 2024))
             if modifier:
                 query = f"{query} {modifier}"
                 
         logger.debug(f"Сгенерирован новый поисковый запрос для радио: '{query}'")
         return query
 
-    async def _fetch_playlist(self, query: str) -> bool:
+    async def _search_tracks(self, query: str) -> List[TrackInfo]:
         """
-        Ищет и добавляет треки в плейлист.
-        Возвращает True, если треки были добавлены, иначе False.
+        Ищет треки по запросу, постепенно ослабляя фильтры: выдача запрашивается
+        один раз, а фильтры по длительности и популярности применяются к ней локально.
+        Результаты кэшируются на время режима: повторный запрос (запросы
+        берутся из небольшого пула) не идет в сеть.
         """
+        cached = self._search_cache.get(query)
+        if cached is not None:
+            cached_at, tracks = cached
+            if time.monotonic() - cached_at < SEARCH_CACHE_TTL_S:
+                self._search_cache.move_to_end(query)
+                logger.debug(f"[Радио] Результаты поиска '{query}' взяты из кэша.")
+                return list(tracks)
+            del self._search_cache[query]
+
         logger.info(f"[Радио] Ищу треки по запросу: '{query}'")
-        
-        # Попытка 1: Строгие фильтры
-        new_tracks = await self._downloader.search(
+
+        settings = self._settings
+        # Один сетевой запрос с самым мягким фильтром (только ограничение по длине);
+        # более строгие уровни отбираются из той же выдачи локально
+        found = await self._downloader.search(
             query,
             limit=50,
-            min_duration=self._settings.RADIO_MIN_DURATION_S,
-            max_duration=self._settings.RADIO_MAX_DURATION_S,
-            min_views=self._settings.RADIO_MIN_VIEWS,
-            min_likes=self._settings.RADIO_MIN_LIKES,
+            max_duration=settings.RADIO_MAX_DURATION_S,
         )
-        
-        # Попытка 2: Без фильтров по популярности
-        if not new_tracks:
-            logger.warning(f"[Радио] Поиск '{query}' с фильтрами популярности не дал результатов. Пробую без них.")
-            new_tracks = await self._downloader.search(
-                query, 
-                limit=50, 
-                min_duration=self._settings.RADIO_MIN_DURATION_S,
-                max_duration=self._settings.RADIO_MAX_DURATION_S
-            )
-            
-        # Попытка 3: Самый мягкий поиск (только ограничение по длине)
-        if not new_tracks:
-            logger.warning(f"[Радио] Поиск '{query}' со стандартными фильтрами не дал результатов. Пробую самый мягкий поиск.")
-            new_tracks = await self._downloader.search(
-                query,
-                limit=20,
-                max_duration=self._settings.RADIO_MAX_DURATION_S # Оставляем только макс. длину
-            )
+        min_duration = settings.RADIO_MIN_DURATION_S
+        min_views = settings.RADIO_MIN_VIEWS
+        min_likes = settings.RADIO_MIN_LIKES
+        # Уровень 2: Без фильтров по популярности
+        long_enough = [t for t in found if not min_duration or t.duration >= min_duration]
+        # Уровень 1: Строгие фильтры. Если источник не сообщает просмотры и лайки
+        # (Internet Archive), фильтровать по ним нечего и уровень 2 — не ослабление
+        if any(t.view_count is not None or t.like_count is not None for t in found):
+            popular = [
+                t for t in long_enough
+                if (not min_views or (t.view_count or 0) >= min_views)
+                and (not min_likes or (t.like_count or 0) >= min_likes)
+            ]
+        else:
+            popular = long_enough
+
+        # Берем первый непустой результат в порядке строгости фильтров
+        new_tracks = None
+        for level, tier in enumerate((popular, long_enough, found), 1):
+            if tier:
+                new_tracks = tier
+                if level > 1:
+                    logger.warning(f"[Радио] Поиск '{query}' дал результаты только с ослабленными фильтрами (уровень {level}).")
+                break
+
+        if new_tracks:
+            self._search_cache[query] = (time.monotonic(), tuple(new_tracks))
+            if len(self._search_cache) > SEARCH_CACHE_MAX:
+                self._search_cache.popitem(last=False)
+        return list(new_tracks or ())
+
+    def _current_mode_label(self) -> Tuple[str, str]:
+        """
+        Значок и название текущего режима для подписи к треку.
+        Пересчитываются, только если режим сменился с прошлого трека.
+        """
+        mode_key = self._mode_key()
+        if mode_key != self._mode_label_key:
+            self._mode_label_key = mode_key
+            if self.artist_mode:
+                self._mode_label = ("🎤", self.artist_mode)
+            elif self.current_mood:
+                self._mode_label = ("😊", genre_display_name(self.current_mood))
+            else:
+                self._mode_label = ("🎶", genre_display_name(self.winning_genre or "rock"))
+        return self._mode_label
+
+    async def _fetch_playlist(self, query: str) -> bool:
+        """
+        Ищет и добавляет треки в плейлист.
+        Возвращает False, если поиск не дал новых треков для текущего режима.
+        """
+        generation = self._playlist_generation
+        new_tracks = await self._search_tracks(query)
+        if generation != self._playlist_generation:
+            # Пока шел поиск, режим сменился: треки для старого режима не нужны.
+            # Неудачей это не считается
+            logger.info(f"[Радио] Режим сменился во время поиска '{query}', результаты отброшены.")
+            return True
 
         if new_tracks:
-            unique_tracks = [track for track in new_tracks if track.identifier not in self._played_ids]
+            # За один проход отсеиваем сыгранные, уже стоящие в очереди и повторяющиеся
+            # в выдаче треки; просмотр прекращается, как только набрано достаточно
+            # (методы привязаны к локальным именам, чтобы не искать атрибуты на каждой итерации)
+            skip_ids = self._played_ids | {track.identifier for track in self._playlist}
+            recently_failed = self._recently_failed
+            unique_tracks = []
+            for track in new_tracks:
+                track_id = track.identifier
+                if track_id in skip_ids or recently_failed(track_id):
+                    continue
+                skip_ids.add(track_id)
+                unique_tracks.append(track)
+                if len(unique_tracks) >= PLAYLIST_BATCH_MAX:
+                    break
             if not unique_tracks:
+                # Все найденные треки уже сыграны: в следующий раз запрос идет в сеть
+                self._search_cache.pop(query, None)
                 return False
                 
             random.shuffle(unique_tracks)
             self._playlist.extend(unique_tracks)
             logger.info(f"[Радио] Добавлено {len(unique_tracks)} уник. треков. Всего в плейлисте: {len(self._playlist)}")
+            await self._save_playlist()
             return True
         else:
             logger.error(f"[Радио] Не удалось получить плейлист для запроса '{query}' после всех попыток.")
             return False
 
-    async def _send_audio(self, chat_id: int, result: DownloadResult, caption: str):
-        if not result.file_path or not os.path.exists(result.file_path):
-            logger.error(f"[Радио] Файл для отправки не найден: {result.file_path}")
+    def _reset_playlist(self):
+        """
+        Очищает плейлист и кэш поиска при смене режима и сбрасывает счетчик неудачных поисков.
+        """
+        self._playlist.clear()
+        self._playlist_generation += 1
+        self._fetch_failure_count = 0
+        self._search_cache.clear()
+
+    # --- Сохранение плейлиста между перезапусками ---
+
+    def _mode_key(self) -> List[Optional[str]]:
+        """Текущий режим радио в виде, пригодном для JSON."""
+        return [self.artist_mode, self.current_mood, self.winning_genre]
+
+    async def _save_playlist(self):
+        """
+        Сохраняет плейлист и историю сыгранных треков на диск, чтобы после
+        перезапуска не искать треки заново и не повторять уже сыгранные.
+        """
+        state = {
+            "saved_at": time.time(),
+            "mode": self._mode_key(),
+            "playlist": [asdict(track) for track in self._playlist],
+            "played": list(self._played_order),
+        }
+        path = self._settings.RADIO_PLAYLIST_PATH
+        # Пишем во временный файл и подменяем им основной: прерванная запись
+        # не оставит обрезанный JSON вместо сохраненной истории
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            await aiofiles.os.makedirs(path.parent, exist_ok=True)
+            async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+                await f.write(json.dumps(state, ensure_ascii=False))
+            await aiofiles.os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[Радио] Не удалось сохранить плейлист: {e}")
+
+    async def _load_playlist(self):
+        """
+        Загружает историю сыгранных треков, а также плейлист, если он свежий
+        и собран для текущего режима.
+        """
+        try:
+            async with aiofiles.open(self._settings.RADIO_PLAYLIST_PATH, "r", encoding="utf-8") as f:
+                state = json.loads(await f.read())
+        except FileNotFoundError:
             return
-        
+        except (OSError, ValueError) as e:
+            logger.warning(f"[Радио] Не удалось прочитать сохраненный плейлист: {e}")
+            return
+
+        # История не зависит от режима и возраста плейлиста
+        for track_id in state.get("played", ()):
+            self._remember_played(track_id)
+
+        if time.time() - state.get("saved_at", 0) > self._settings.RADIO_PLAYLIST_TTL_S:
+            return
+        if state.get("mode") != self._mode_key():
+            return
+
         try:
-            with open(result.file_path, "rb") as audio_file:
+            tracks = [TrackInfo(**track) for track in state.get("playlist", ())]
+        except TypeError as e:
+            logger.warning(f"[Радио] Сохраненный плейлист поврежден: {e}")
+            return
+
+        self._playlist.extend(track for track in tracks if not self._recently_failed(track.identifier))
+        logger.info(f"[Радио] Загружен сохраненный плейлист: {len(self._playlist)} треков.")
+
+    async def _download_track(self, track: TrackInfo) -> DownloadResult:
+        """
+        Готовит трек к отправке. Если трек уже загружался в Telegram,
+        используется его file_id и скачивание не нужно.
+        """
+        file_id = await self._cache.get_file_id(track.identifier)
+        if file_id:
+            logger.debug(f"[Радио] Трек {track.identifier} уже есть в Telegram, скачивание не требуется.")
+            return DownloadResult(success=True, track_info=track, telegram_file_id=file_id)
+        return await self._downloader.download_with_retry(track.identifier)
+
+    async def _send_audio(self, chat_id: int, result: DownloadResult, caption: str) -> bool:
+        """Отправляет трек в чат. Возвращает True, если сообщение с аудио отправлено."""
+        if result.telegram_file_id:
+            try:
+                await self._throttle(chat_id)
                 await self._bot.send_audio(
                     chat_id=chat_id,
-                    audio=audio_file,
+                    audio=result.telegram_file_id,
                     caption=caption,
                     parse_mode=ParseMode.MARKDOWN,
-                    # Передаем метаданные для корректного отображения плеера в клиенте
                     title=result.track_info.title,
                     performer=result.track_info.artist,
                     duration=result.track_info.duration,
                     reply_markup=get_track_control_keyboard(result.track_info.identifier),
                 )
+                return True
+            except BadRequest as e:
+                if not _is_stale_file_id_error(e):
+                    # Ошибка не в файле (например, в разметке подписи): file_id оставляем
+                    logger.error(f"Ошибка Telegram при отправке радио-аудио по file_id: {e}")
+                    return False
+                # file_id привязан к боту и может устареть (смена токена, удаленный файл):
+                # забываем его и загружаем трек заново
+                logger.warning(f"[Радио] Telegram отклонил file_id трека {result.track_info.identifier}, скачиваю заново: {e}")
+                await self._cache.delete_file_id(result.track_info.identifier)
+            except TelegramError as e:
+                logger.error(f"Ошибка Telegram при отправке радио-аудио по file_id: {e}")
+                return False
+
+            result = await self._downloader.download_with_retry(result.track_info.identifier)
+            if not result.success:
+                logger.error(f"[Радио] Не удалось скачать трек повторно: {result.error}")
+                return False
+
+        if not result.file_path:
+            logger.error("[Радио] Нет пути к файлу для отправки.")
+            return False
+
+        try:
+            # Отдельная проверка существования не нужна: ее делает сам open()
+            try:
+                audio = await read_audio_file(result.file_path)
+            except FileNotFoundError:
+                logger.error(f"[Радио] Файл для отправки не найден: {result.file_path}")
+                return False
+            await self._throttle(chat_id)
+            message = await self._bot.send_audio(
+                chat_id=chat_id,
+                audio=audio,
+                caption=caption,
+                parse_mode=ParseMode.MARKDOWN,
+                # Передаем метаданные для корректного отображения плеера в клиенте
+                title=result.track_info.title,
+                performer=result.track_info.artist,
+                duration=result.track_info.duration,
+                reply_markup=get_track_control_keyboard(result.track_info.identifier),
+                # Загрузка файла дольше обычного запроса: без этого PTB обрывает ее через 20 с
+                write_timeout=self._settings.UPLOAD_TIMEOUT_S,
+            )
+            # Запоминаем file_id: при следующем проигрывании трек не придется скачивать и загружать
+            if message.audio:
+                await self._cache.set_file_id(result.track_info.identifier, message.audio.file_id)
+            return True
         except TelegramError as e:
             logger.error(f"Ошибка Telegram при отправке радио-аудио: {e}")
+            return False
         finally:
             try:
-                os.remove(result.file_path)
+                await aiofiles.os.remove(result.file_path)
+            except FileNotFoundError:
+                pass
             except OSError as e:
                 logger.error(f"Не удалось удалить файл {result.file_path}: {e}")
 
+    def _recently_failed(self, track_id: str) -> bool:
+        """Проверяет, не падала ли загрузка этого трека в последний час."""
+        failed_at = self._failed_tracks.get(track_id)
+        if failed_at is None:
+            return False
+        if time.monotonic() - failed_at < FAILED_TRACK_TTL_S:
+            return True
+        del self._failed_tracks[track_id]
+        return False
+
+    def _mark_failed(self, track_id: str):
+        """Запоминает трек, который не удалось скачать."""
+        self._failed_tracks[track_id] = time.monotonic()
+        self._failed_tracks.move_to_end(track_id)
+        if len(self._failed_tracks) > FAILED_TRACKS_MAX:
+            self._failed_tracks.popitem(last=False)
+
+    def _remember_played(self, track_id: str):
+        """Добавляет трек в историю; при переполнении забывается самый старый."""
+        if len(self._played_order) >= self._settings.RADIO_PLAYED_HISTORY_MAX:
+            self._played_ids.discard(self._played_order.popleft())
+        self._played_order.append(track_id)
+        self._played_ids.add(track_id)
+
+    def _take_next_track(self) -> Optional[TrackInfo]:
+        """Достает из плейлиста следующий еще не игравший трек и отмечает его сыгранным."""
+        while self._playlist:
+            track = self._playlist.popleft()
+            if track.identifier in self._played_ids or self._recently_failed(track.identifier):
+                continue
+
+            self._remember_played(track.identifier)
+            return track
+        return None
+
+    def _start_prefetch(self):
+        """Запускает фоновое скачивание следующего трека из плейлиста."""
+        track = self._take_next_track()
+        if track is None:
+            return
+        task = self._spawn(self._download_track(track))
+        self._prefetch = (track, task, self._mode_key())
+        logger.debug(f"[Радио] Заранее скачиваю следующий трек: {track.display_name}")
+
+    def _discard_prefetch(self):
+        """
+        Отбрасывает предзагрузку. Отмена задачи не остановила бы yt-dlp в пуле
+        потоков, и файл все равно появился бы, поэтому загрузке дают завершиться,
+        а скачанный файл удаляется.
+        """
+        if self._prefetch is None:
+            return
+        _, task, _ = self._prefetch
+        self._prefetch = None
+
+        if task.done():
+            self._remove_prefetched_file(task)
+        else:
+            task.add_done_callback(self._remove_prefetched_file)
+
+    def _remove_prefetched_file(self, task: asyncio.Task):
+        """Удаляет файл отброшенной предзагрузки, когда она завершилась."""
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result.success and result.file_path:
+            self._spawn(self._remove_file_quietly(result.file_path))
+
+    @staticmethod
+    async def _remove_file_quietly(path: str):
+        try:
+            await aiofiles.os.remove(path)
+        except OSError:
+            pass
+
+    async def _throttle(self, chat_id: int):
+        """
+        Выдерживает не менее CHAT_SEND_MIN_INTERVAL_S между запросами бота в один чат.
+        Вызывается перед каждой отправкой или правкой сообщения.
+        """
+        lock = self._chat_send_locks.get(chat_id)
+        if lock is None:
+            lock = self._chat_send_locks[chat_id] = asyncio.Lock()
+        async with lock:
+            delay = self._chat_last_send.get(chat_id, 0.0) + CHAT_SEND_MIN_INTERVAL_S - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._chat_last_send[chat_id] = time.monotonic()
+
+    async def _set_status(self, chat_id: int, text: str):
+        """
+        Показывает статус радио в одном сообщении: если оно уже есть, текст
+        редактируется, а одинаковый текст повторно не отправляется.
+        """
+        if self._status_message is not None:
+            if text == self._last_status_text:
+                return
+            try:
+                await self._throttle(chat_id)
+                await self._status_message.edit_text(text)
+                self._last_status_text = text
+                return
+            except TelegramError as e:
+                logger.debug(f"Не удалось изменить статус радио, отправляю новый: {e}")
+                self._status_message = None
+
+        await self._throttle(chat_id)
+        self._status_message = await self._bot.send_message(chat_id, text)
+        self._last_status_text = text
+
+    def _clear_status(self):
+        """
+        Удаляет сообщение со статусом радио, если оно есть.
+        Удаление идет в фоне: цикл радио не ждет ответа Telegram.
+        """
+        status_message = self._status_message
+        self._status_message = None
+        self._last_status_text = None
+        if status_message is not None:
+            self._spawn(self._delete_message_quietly(status_message))
+
+    @staticmethod
+    async def _delete_message_quietly(message: Message):
+        try:
+            await message.delete()
+        except TelegramError:
+            pass
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """
+        Запускает фоновую задачу. Ссылка на задачу хранится до ее завершения,
+        иначе сборщик мусора может уничтожить ее посреди работы.
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+        return task
+
+    def _on_background_task_done(self, task: asyncio.Task):
+        """Убирает завершенную фоновую задачу и логирует ее исключение, если оно было."""
+        self._background_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error(f"[Радио] Ошибка в фоновой задаче: {exc}", exc_info=exc)
+
+    async def _cooldown(self, seconds: float) -> bool:
+        """
+        Пауза между треками. Возвращает True, если ее прервал skip()
+        (в том числе нажатый еще до начала паузы).
+        """
+        if not self._skip_event.is_set():
+            try:
+                await asyncio.wait_for(self._skip_event.wait(), timeout=seconds)
+            except asyncio.TimeoutError:
+                return False
+        self._skip_event.clear()
+        return True
+
+    def _error_backoff(self) -> float:
+        """
+        Задержка после ошибки: растет экспоненциально с числом ошибок подряд.
+        Случайный множитель (джиттер) разносит повторы во времени.
+        """
+        delay = min(MAX_ERROR_BACKOFF_S, 2 ** self.error_count)
+        return delay * random.uniform(0.5, 1.5)
+
     async def _radio_loop(self, chat_id: int):
+        # Локальные ссылки на часто используемые объекты цикла
+        bot = self._bot
+        download = self._download_track
+        retry_delay = self._settings.RETRY_DELAY_S
+
         while self._is_on and self.error_count < 10:
             try:
                 # --- Управление голосованием и режимами ---
-                if not self._vote_in_progress and (self.mode_end_time is None or datetime.now() >= self.mode_end_time):
+                if not self._vote_in_progress and (self.mode_end_time is None or time.monotonic() >= self.mode_end_time):
                     self.start_genre_vote(chat_id)
-                    self.mode_end_time = datetime.now() + timedelta(minutes=30)
                 
                 # --- Логика наполнения плейлиста ---
                 if len(self._playlist) < 5:
@@ -428,7 +995,8 @@ class RadioService:
                 # --- Логика смены жанра при неудачах ---
                 if self._fetch_failure_count >= 3:
                     logger.warning(f"[Радио] Не удалось найти треки для жанра '{self.winning_genre}' 3 раза подряд. Меняю жанр.")
-                    await self._bot.send_message(chat_id, f"😕 Не могу найти музыку по жанру «{self.winning_genre}». Попробую что-нибудь другое...")
+                    await self._throttle(chat_id)
+                    await bot.send_message(chat_id, f"😕 Не могу найти музыку по жанру «{self.winning_genre}». Попробую что-нибудь другое...")
 
                     old_genre = self.winning_genre
                     new_genre = random.choice(self._settings.RADIO_GENRES)
@@ -438,63 +1006,76 @@ class RadioService:
                     self.winning_genre = new_genre
                     self.artist_mode = None
                     self.current_mood = None
-                    self._fetch_failure_count = 0  # Сбрасываем счетчик
+                    self._reset_playlist()  # Сбрасываем и счетчик неудач
                     
                     logger.info(f"[Радио] Жанр автоматически изменен на '{self.winning_genre}'.")
-                    await self._bot.send_message(chat_id, f"✅ Радио переключилось на жанр: **{self.winning_genre.capitalize()}**", parse_mode=ParseMode.MARKDOWN)
+                    await self._throttle(chat_id)
+                    await bot.send_message(chat_id, f"✅ Радио переключилось на жанр: **{genre_display_name(self.winning_genre)}**", parse_mode=ParseMode.MARKDOWN)
                     continue # Перезапускаем цикл, чтобы сразу искать по новому жанру
 
                 # --- Проигрывание трека ---
-                if not self._playlist:
-                    logger.info("Плейлист пуст, ищу новую музыку...")
-                    await asyncio.sleep(self._settings.RETRY_DELAY_S)
-                    continue
-                
-                track_to_play = self._playlist.pop(random.randint(0, len(self._playlist) - 1))
-                if track_to_play.identifier in self._played_ids:
-                    continue 
-                
-                self._played_ids.add(track_to_play.identifier)
-                if len(self._played_ids) > 500:
-                    self._played_ids.discard(next(iter(self._played_ids), None))
+                if self._prefetch is not None and self._prefetch[2] != self._mode_key():
+                    # Пока трек скачивался, режим сменился — он уже не подходит
+                    logger.info("[Радио] Режим сменился, заранее скачанный трек отброшен.")
+                    self._discard_prefetch()
 
-                download_msg = await self._bot.send_message(chat_id, f"⏳ Скачиваю: `{track_to_play.display_name}`")
-                result = await self._downloader.download_with_retry(track_to_play.identifier)
+                if self._prefetch is not None:
+                    # Трек уже скачивается (или скачан) во время предыдущего
+                    track_to_play, download_task, _ = self._prefetch
+                    self._prefetch = None
+                else:
+                    if not self._playlist:
+                        logger.info("Плейлист пуст, ищу новую музыку...")
+                        await asyncio.sleep(retry_delay)
+                        continue
+
+                    track_to_play = self._take_next_track()
+                    if track_to_play is None:
+                        continue
+                    download_task = None
+
+                if download_task is None or not download_task.done():
+                    await self._set_status(chat_id, f"⏳ Скачиваю: `{track_to_play.display_name}`")
+                if download_task is not None:
+                    result = await download_task
+                else:
+                    result = await download(track_to_play)
 
                 # --- Обработка результата скачивания ---
                 if result.success:
-                    self.error_count = 0
-                    mode_icon = "🎤" if self.artist_mode else "😊" if self.current_mood else "🎶"
-                    mode_name = self.artist_mode or (self.current_mood.capitalize() if self.current_mood else (self.winning_genre or 'rock').capitalize())
-                    mode_line = f"{mode_icon} **Режим:** `{mode_name}`"
-                    caption_text = (
-                        f"📻 **Groove AI Radio**\n"
-                        f"{mode_line}\n\n"
-                        f"🎧 **Трек:** `{result.track_info.title}`\n"
-                        f"👤 **Исполнитель:** `{result.track_info.artist}`\n"
-                        f"⏳ **Длительность:** `{result.track_info.format_duration()}`"
+                    mode_icon, mode_name = self._current_mode_label()
+                    track_info = result.track_info
+                    caption_text = CAPTION_TEMPLATE.format(
+                        mode_icon=mode_icon,
+                        mode_name=mode_name,
+                        title=track_info.title,
+                        artist=track_info.artist,
+                        duration=track_info.format_duration(),
                     )
-                    await self._send_audio(chat_id, result, caption=caption_text)
-                    try:
-                        await self._bot.delete_message(chat_id, download_msg.message_id)
-                    except TelegramError:
-                        pass
-                    
-                    try:
-                        await asyncio.wait_for(self._skip_event.wait(), timeout=90)
-                        self._skip_event.clear()
-                        logger.info("[Радио] Трек пропущен или его время истекло.")
-                    except asyncio.TimeoutError:
+                    # Счетчик ошибок подряд сбрасывается, только когда трек действительно
+                    # дошел до чата; неудачная отправка считается такой же ошибкой
+                    if await self._send_audio(chat_id, result, caption=caption_text):
+                        self.error_count = 0
+                    else:
+                        self.error_count += 1
+                    self._clear_status()
+
+                    # Скачивание следующего трека идет параллельно с паузой
+                    self._start_prefetch()
+                    # Сохраняем плейлист без отыгранных треков: после перезапуска они не повторятся
+                    await self._save_playlist()
+
+                    if await self._cooldown(90):
+                        logger.info("[Радио] Трек пропущен.")
+                    else:
                         logger.info("[Радио] 90 секунд истекли, переключаюсь на следующий трек.")
                 else:
                     logger.warning(f"[Радио] Ошибка скачивания: {result.error}")
+                    self._mark_failed(track_to_play.identifier)
                     self.error_count += 1
-                    try:
-                        await download_msg.edit_text(f"⚠️ Ошибка скачивания, пробую следующий трек...")
-                        await asyncio.sleep(3)
-                        await download_msg.delete()
-                    except TelegramError:
-                        pass
+                    # Сообщение не удаляем: следующий статус отредактирует его
+                    await self._set_status(chat_id, "⚠️ Ошибка скачивания, пробую следующий трек...")
+                    await asyncio.sleep(self._error_backoff())
 
             except asyncio.CancelledError:
                 logger.info("[Радио] Цикл остановлен.")
@@ -502,10 +1083,12 @@ class RadioService:
             except Exception as e:
                 logger.error(f"Непредвиденная ошибка в цикле радио: {e}", exc_info=True)
                 self.error_count += 1
-                await asyncio.sleep(5)
+                await asyncio.sleep(self._error_backoff())
 
         if self.error_count >= 10:
             logger.error("[Радио] Превышено макс. кол-во ошибок. Радио остановлено.")
         
+        self._discard_prefetch()
+        self._clear_status()
         self._is_on = False
         logger.info(f"⏹️ Радио-цикл завершен для чата {chat_id}.")